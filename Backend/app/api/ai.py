@@ -492,7 +492,9 @@ async def ai_conversation(
         
         logger.info(f"AI conversation processed for {current_user.email}: {request.message[:50]}...")
         
-        return AIConversationResponse(
+        # The handler's result is built server-side, and FastAPI checks it
+        # against response_model on the way out anyway
+        return AIConversationResponse.model_construct(
             response=result.get("response", ""),
             tool_calls=result.get("tool_calls", []),
             success=result.get("success", False),
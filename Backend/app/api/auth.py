@@ -7,6 +7,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -15,7 +16,7 @@ from app.config import settings
 from app.core.auth import (
     authenticate_user, create_access_token, create_refresh_token,
     get_current_user, get_password_hash, get_user_by_email,
-    get_user_session, invalidate_all_user_sessions, invalidate_refresh_token,
+    invalidate_all_user_sessions, invalidate_refresh_token,
     save_refresh_token, verify_token, verify_password, clear_user_account_data
 )
 from app.database import get_session
@@ -61,7 +62,7 @@ async def register(
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
         full_name = f"{user_data.first_name} {user_data.last_name}".strip()
         user = User(
             email=user_data.email,
@@ -202,9 +203,9 @@ async def refresh_token(
                 detail="Invalid refresh token"
             )
         
-        # Check if refresh token exists in database
-        user_session = await get_user_session(session, token_data.refresh_token)
-        if not user_session:
+        # Claim the refresh token; the UPDATE only matches an active session, so
+        # of two concurrent refreshes with the same token only one gets through
+        if not await invalidate_refresh_token(session, token_data.refresh_token):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
@@ -222,9 +223,6 @@ async def refresh_token(
         access_token = create_access_token(data={"sub": str(user.id)})
         new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
         
-        # Invalidate old refresh token
-        await invalidate_refresh_token(session, token_data.refresh_token)
-        
         # Save new refresh token
         user_agent = request.headers.get("user-agent")
         client_ip = request.client.host if request.client else None
@@ -394,14 +392,18 @@ async def change_password(
         from app.core.auth import verify_password
         
         # Verify current password
-        if not verify_password(password_data.current_password, current_user.hashed_password):
+        if not await run_in_threadpool(
+            verify_password, password_data.current_password, current_user.hashed_password
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
         
         # Update password
-        current_user.hashed_password = get_password_hash(password_data.new_password)
+        current_user.hashed_password = await run_in_threadpool(
+            get_password_hash, password_data.new_password
+        )
         await session.commit()
         
         # Invalidate all user sessions (force re-login)
@@ -446,7 +448,7 @@ async def clear_account_data(
     """
     try:
         # Verify password
-        if not verify_password(clear_data.password, current_user.hashed_password):
+        if not await run_in_threadpool(verify_password, clear_data.password, current_user.hashed_password):
             logger.warning(f"Failed account data clear attempt - wrong password: {current_user.email}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
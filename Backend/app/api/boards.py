@@ -2,6 +2,7 @@
 Board and card management endpoints
 """
 import logging
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 
@@ -443,7 +444,6 @@ async def update_card(
         
         # Set completion timestamp if moving to done
         if card_update.status == "done" and card.status != "done":
-            from datetime import datetime, timezone
             card.completed_at = datetime.now(timezone.utc)
         elif card_update.status != "done" and card.status == "done":
             card.completed_at = None
@@ -509,7 +509,6 @@ async def move_card(
         
         # Set completion timestamp if moving to done
         if move_data.status == "done" and old_status != "done":
-            from datetime import datetime, timezone
             card.completed_at = datetime.now(timezone.utc)
         elif move_data.status != "done" and old_status == "done":
             card.completed_at = None
@@ -2,7 +2,7 @@
 Quest API endpoints for daily productivity tracking
 """
 import logging
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
@@ -121,7 +121,6 @@ async def get_quest_archive(
         if not end_date:
             end_date = date.today()
         if not start_date:
-            from datetime import timedelta
             start_date = end_date - timedelta(days=limit-1)
         
         # Get distinct dates with quests
@@ -3,6 +3,7 @@ Global search endpoints
 """
 import logging
 import time
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
@@ -419,8 +420,6 @@ async def _search_journal_entries(session: AsyncSession, user_id: UUID, query: s
 async def _search_quests(session: AsyncSession, user_id: UUID, query: str, limit: int, offset: int) -> List[SearchResult]:
     """Search quests by content."""
     try:
-        from datetime import date, datetime, timezone
-        
         search_query = select(Quest).where(
             and_(
                 Quest.user_id == user_id,
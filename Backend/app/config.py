@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     # Database
     database_url: str = Field(env="DATABASE_URL")
     database_test_url: Optional[str] = Field(default=None, env="DATABASE_TEST_URL")
+    db_pool_size: int = Field(default=25, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=25, env="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=300, env="DB_POOL_RECYCLE")
+    db_pool_timeout: int = Field(default=10, env="DB_POOL_TIMEOUT")
     
     # JWT Configuration
     jwt_secret_key: str = Field(env="JWT_SECRET_KEY")
@@ -103,6 +107,10 @@ class Settings(BaseSettings):
     def validate_database_url(cls, v):
         if not v:
             raise ValueError('Database URL is required')
+        # The engine is async, so plain postgres URLs are pointed at asyncpg
+        for prefix in ('postgresql://', 'postgres://', 'postgresql+psycopg2://'):
+            if v.startswith(prefix):
+                return 'postgresql+asyncpg://' + v[len(prefix):]
         return v
     
     model_config = SettingsConfigDict(
@@ -1,21 +1,26 @@
 """
 AI Conversation Handler with OpenAI Integration
 """
-import json
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 import openai
+import orjson
 import asyncio
 from collections import defaultdict
 
 from app.config import settings
 from app.models.user import User
-from app.core.ai_tools import get_tools_for_openai, execute_ai_tool, AI_TOOLS_REGISTRY
+from app.core.ai_tools import get_tools_for_openai, execute_ai_tool, execute_ai_tools, AI_TOOLS_REGISTRY
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps_tool_result(result: Dict[str, Any]) -> str:
+    """Serialize a tool result, including raw UUID/date values, for the LLM"""
+    return orjson.dumps(result, option=orjson.OPT_NAIVE_UTC).decode()
+
+
 class ConversationMemory:
     """In-memory conversation history management with automatic cleanup"""
     
@@ -72,12 +77,12 @@ class ConversationMemory:
         # Keep only the most recent messages, but ensure we don't break tool_call pairs
         self._trim_conversation(user_id)
     
-    def add_tool_result(self, user_id: str, tool_call_id: str, result: Dict[str, Any]):
-        """Add a tool result message to user's conversation history"""
+    def add_tool_result(self, user_id: str, tool_call_id: str, content: str):
+        """Add an already-serialized tool result message to user's conversation history"""
         message = {
             "role": "tool",
             "tool_call_id": tool_call_id,
-            "content": json.dumps(result)
+            "content": content
         }
         
         self.conversations[user_id].append(message)
@@ -321,9 +326,6 @@ Remember: You're not just a tool executor - you're an intelligent assistant that
         user_id = str(user.id)
         
         try:
-            # Import execute_ai_tool at the top to avoid scoping issues
-            from app.core.ai_tools import execute_ai_tool
-            
             # Build conversation messages with system prompt
             messages = [
                 {"role": "system", "content": self._get_system_prompt(user)}
@@ -400,6 +402,7 @@ Remember: You're not just a tool executor - you're an intelligent assistant that
             
             # Handle tool calls
             tool_results = []
+            tool_contents: List[str] = []
             if assistant_message.tool_calls:
                 # Add the assistant message with tool calls first
                 messages.append({
@@ -415,23 +418,31 @@ Remember: You're not just a tool executor - you're an intelligent assistant that
                     } for tool_call in assistant_message.tool_calls]
                 })
                 
-                for tool_call in assistant_message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    
-                    # Execute the tool
-                    result = await execute_ai_tool(tool_name, tool_args, user, session)
+                calls = [
+                    (tool_call.function.name, orjson.loads(tool_call.function.arguments))
+                    for tool_call in assistant_message.tool_calls
+                ]
+                
+                # Execute the tools, with consecutive searches run together
+                results = await execute_ai_tools(calls, user, session)
+                
+                for tool_call, (tool_name, tool_args), result in zip(
+                    assistant_message.tool_calls, calls, results
+                ):
                     tool_results.append({
                         "tool_name": tool_name,
                         "tool_args": tool_args,
                         "result": result
                     })
                     
-                    # Add tool result to conversation for context
+                    # Add tool result to conversation for context, serialized once
+                    # and reused for the conversation memory below
+                    content = _dumps_tool_result(result)
+                    tool_contents.append(content)
                     messages.append({
                         "role": "tool",
                         "tool_call_id": tool_call.id,
-                        "content": json.dumps(result)
+                        "content": content
                     })
                 
                 # Get final response after tool execution
@@ -467,8 +478,8 @@ Remember: You're not just a tool executor - you're an intelligent assistant that
             # Add tool results to memory if there were tool calls
             if assistant_message.tool_calls:
                 for i, tool_call in enumerate(assistant_message.tool_calls):
-                    if i < len(tool_results):
-                        self.memory.add_tool_result(user_id, tool_call.id, tool_results[i]["result"])
+                    if i < len(tool_contents):
+                        self.memory.add_tool_result(user_id, tool_call.id, tool_contents[i])
             
             # Calculate token usage
             total_tokens = response.usage.total_tokens if hasattr(response, 'usage') else 0
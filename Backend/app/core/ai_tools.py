@@ -1,28 +1,50 @@
 """
 AI Tools for natural language processing and automation
 """
-import json
+import asyncio
+import itertools
 import logging
 import random
-from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any, Callable
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, ClassVar, Dict, FrozenSet, List, Mapping,
+    Optional, Tuple, Type
+)
 from uuid import UUID
-from pydantic import BaseModel, Field
+import fastjsonschema
+import httpx
+import orjson
+from sqlalchemy import (
+    JSON, Date, Integer, String, Uuid, bindparam, delete, exists, insert, lambda_stmt, literal, update
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select, func, and_
+
+try:
+    # Optional C parser that accepts the full ISO 8601 grammar, including 'Z'
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    _parse_iso_datetime = None
 
 from app.config import settings
 from app.models.user import User
 from app.models.board import Board, Card
 from app.models.calendar import CalendarEvent
 from app.models.journal import JournalEntry
-from app.schemas.board import BoardCreate, CardCreate
-from app.schemas.calendar import CalendarEventCreate
-from app.schemas.journal import JournalEntryCreate
+from app.models.quest import Quest
 
 logger = logging.getLogger(__name__)
 
 
-# Color palettes for random selection
-CALENDAR_COLORS = [
+# Color palettes for random selection; calendars use the base palette and
+# boards extend it, so the shared colors are defined once
+_BASE_COLORS = (
     "#3b82f6",  # blue
     "#ef4444",  # red
     "#10b981",  # green
@@ -33,42 +55,253 @@ CALENDAR_COLORS = [
     "#84cc16",  # lime
     "#f97316",  # orange
     "#6366f1",  # indigo
-]
+)
 
-BOARD_COLORS = [
-    "#3b82f6",  # blue
-    "#ef4444",  # red
-    "#10b981",  # green
-    "#f59e0b",  # yellow
-    "#8b5cf6",  # purple
-    "#06b6d4",  # cyan
-    "#ec4899",  # pink
-    "#84cc16",  # lime
-    "#f97316",  # orange
-    "#6366f1",  # indigo
-    "#10b981",  # emerald
+CALENDAR_COLORS = _BASE_COLORS
+
+BOARD_COLORS = _BASE_COLORS + (
     "#14b8a6",  # teal
-    "#8b5cf6",  # violet
     "#f43f5e",  # rose
     "#64748b",  # slate
-]
+    "#0ea5e9",  # sky
+)
+
+# Private generator, bound once, so picking a color skips the module-level indirection
+_randrange = random.Random().randrange
 
 
 def get_random_calendar_color() -> str:
     """Get a random color for calendar events"""
-    return random.choice(CALENDAR_COLORS)
+    return CALENDAR_COLORS[_randrange(len(CALENDAR_COLORS))]
 
 
 def get_random_board_color() -> str:
     """Get a random color for boards"""
-    return random.choice(BOARD_COLORS)
+    return BOARD_COLORS[_randrange(len(BOARD_COLORS))]
+
+
+# Parsed values are immutable and the LLM tends to repeat the same few dates,
+# so a small cache skips re-parsing them
+@lru_cache(maxsize=256)
+def _parse_dt(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC"""
+    if _parse_iso_datetime is not None:
+        return _parse_iso_datetime(value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=256)
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date"""
+    return date.fromisoformat(value)
+
+
+def _date_or_today(value: Optional[str]) -> date:
+    """Parse an optional YYYY-MM-DD date, defaulting to today"""
+    return _parse_date(value) if value else date.today()
+
+
+# English month names, so display strings don't go through locale-aware strftime
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+
+def _format_clock(value: datetime) -> str:
+    """Format a time like strftime('%I:%M %p')"""
+    return f"{value.hour % 12 or 12:02d}:{value.minute:02d} {'AM' if value.hour < 12 else 'PM'}"
+
+
+def _format_event_start(value: datetime) -> str:
+    """Format a timestamp like strftime('%B %d, %Y at %I:%M %p')"""
+    return f"{_MONTHS[value.month - 1]} {value.day:02d}, {value.year} at {_format_clock(value)}"
+
+
+@lru_cache(maxsize=1024)
+def _uuid(value: str) -> UUID:
+    """Parse a UUID string, reusing the result for ids the model repeats"""
+    return UUID(value)
+
+
+# Longest search text used in a substring match, to bound the index probe
+_MAX_MATCH_LENGTH = 120
+
+
+def _ilike_escape(value: str) -> str:
+    """Escape LIKE wildcards so user text is matched literally"""
+    value = value[:_MAX_MATCH_LENGTH]
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# Shortest text a trigram index can serve; shorter text is matched as a prefix
+_MIN_TRIGRAM_LENGTH = 3
+
+
+def _quest_match(user_id: UUID, quest_date: date, quest_content: str):
+    """Condition locating a user's quest for a day by (partial) content"""
+    escaped = _ilike_escape(quest_content)
+    if len(quest_content) < _MIN_TRIGRAM_LENGTH:
+        # Served by the lower(content) text_pattern_ops index
+        content_match = func.lower(Quest.content).like(f"{escaped.lower()}%", escape="\\")
+    else:
+        content_match = Quest.content.ilike(f"%{escaped}%", escape="\\")
+    return and_(Quest.user_id == user_id, Quest.date_created == quest_date, content_match)
+
+
+# Hot lookup statements, built once as lambda statements so SQLAlchemy can
+# reuse the cached construction and compilation on every call
+_FIND_EVENT_BY_TITLE = lambda_stmt(
+    lambda: select(CalendarEvent).where(
+        and_(
+            CalendarEvent.user_id == bindparam("user_id"),
+            CalendarEvent.title.ilike(bindparam("pattern"), escape="\\")
+        )
+    ).order_by(CalendarEvent.start_datetime.desc()).limit(1).execution_options(populate_existing=True)
+)
+
+# The listing tools select only the columns they return, skipping the JSON
+# metadata/settings payloads and identity-map bookkeeping for every row
+_SELECT_EVENTS_IN_RANGE = lambda_stmt(
+    lambda: select(
+        CalendarEvent.id, CalendarEvent.title, CalendarEvent.description,
+        CalendarEvent.start_datetime, CalendarEvent.end_datetime, CalendarEvent.location,
+        CalendarEvent.is_all_day, CalendarEvent.color
+    ).where(
+        and_(
+            CalendarEvent.user_id == bindparam("user_id"),
+            CalendarEvent.start_datetime >= bindparam("start_datetime"),
+            CalendarEvent.start_datetime <= bindparam("end_datetime")
+        )
+    ).order_by(CalendarEvent.start_datetime).limit(bindparam("limit"))
+)
+
+# Builds a fresh copy of the model's default card metadata dict
+_CARD_METADATA_DEFAULT: Callable[[], Dict[str, Any]] = Card.model_fields["card_metadata"].default_factory
+
+_SELECT_BOARDS = lambda_stmt(
+    lambda: select(Board.id, Board.title, Board.description).where(
+        Board.user_id == bindparam("user_id")
+    ).limit(bindparam("limit"))
+)
+
+
+# Set while execute_ai_tools runs a turn's tool calls in one shared transaction
+_in_batch: "ContextVar[bool]" = ContextVar("_in_batch", default=False)
+
+
+@asynccontextmanager
+async def _transaction(session) -> AsyncIterator[None]:
+    """Run a tool's reads and writes atomically, rolling them back if the block fails
+
+    A transaction the tool opens itself is committed on exit. When the caller
+    already has one open, the tool's work goes into a SAVEPOINT instead, so
+    the caller's pending state is neither committed nor rolled back by the tool.
+    """
+    if _in_batch.get():
+        # Part of a batch; the batch's transaction commits for everyone
+        yield
+        return
+    if session.in_transaction():
+        async with session.begin_nested():
+            yield
+        return
+    async with session.begin():
+        yield
+
 
+@asynccontextmanager
+async def _read_only(session) -> AsyncIterator[None]:
+    """Run a tool's pure reads on an AUTOCOMMIT connection so no transaction is held open
 
-class AITool(BaseModel):
-    """Base class for AI tools"""
-    name: str = Field(description="Tool name")
-    description: str = Field(description="Tool description")
-    parameters: Dict[str, Any] = Field(description="Tool parameters schema")
+    Rows must be fetched inside the block. When the caller already has a
+    transaction open, the reads simply run in it.
+    """
+    if _in_batch.get() or session.in_transaction():
+        yield
+        return
+    await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    try:
+        yield
+    finally:
+        # Hand the connection back to the pool, which restores its isolation
+        # level, even if the reads failed
+        await session.rollback()
+
+
+_ToolExecute = Callable[..., Awaitable[Dict[str, Any]]]
+
+
+def ai_tool(fail_msg: str) -> Callable[[_ToolExecute], _ToolExecute]:
+    """Wrap a tool's execute with the shared log/error-envelope handling"""
+    def decorator(fn: _ToolExecute) -> _ToolExecute:
+        @wraps(fn)
+        async def wrapper(self: "AITool", parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
+            try:
+                return await fn(self, parameters, user, session)
+            except (SQLAlchemyError, ValueError) as e:
+                # Database failures and malformed values from the model become an
+                # error result; anything else is a bug and propagates
+                if _in_batch.get():
+                    # Let the batch roll back and replay its calls one by one
+                    raise
+                # _transaction has already rolled back this tool's own work
+                logger.error("%s: %s", fail_msg, e)
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "message": fail_msg
+                }
+        return wrapper
+    return decorator
+
+
+# Compiled parameter validators keyed by tool name, filled in as each tool
+# class is defined. Format checks are left to the tools themselves since they
+# accept looser ISO timestamps than the spec.
+_COMPILED_PARAM_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+# Tool classes keyed by tool name, registered as each tool class is defined
+_TOOL_CLASSES: Dict[str, Type["AITool"]] = {}
+
+
+class AITool:
+    """Base class for AI tools
+    
+    Tools are stateless and their schemas are hard-coded, so they are plain
+    classes rather than Pydantic models that would re-validate on construction.
+    """
+    __slots__ = ()
+    
+    name: ClassVar[str]
+    description: ClassVar[str]
+    parameters: ClassVar[Dict[str, Any]]
+    openai_spec: ClassVar[Dict[str, Any]]
+    # Tools that never touch the session may run alongside each other
+    concurrent: ClassVar[bool] = False
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the tool is configured and should be offered to the model"""
+        return True
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Register the tool and compile its parameters schema once, when the class is defined"""
+        super().__init_subclass__(**kwargs)
+        _TOOL_CLASSES[cls.name] = cls
+        cls.openai_spec = {
+            "type": "function",
+            "function": {
+                "name": cls.name,
+                "description": cls.description,
+                "parameters": cls.parameters
+            }
+        }
+        _COMPILED_PARAM_VALIDATORS[cls.name] = fastjsonschema.compile(
+            cls.parameters, use_formats=False
+        )
     
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute the tool with given parameters"""
@@ -78,9 +311,11 @@ class AITool(BaseModel):
 class CreateJournalEntryTool(AITool):
     """Tool for creating journal entries"""
     
-    name: str = "create_journal_entry"
-    description: str = "Create a new journal entry with title, content, and mood"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "create_journal_entry"
+    description: ClassVar[str] = "Create a new journal entry with title, content, and mood"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "title": {
@@ -105,60 +340,45 @@ class CreateJournalEntryTool(AITool):
         "required": ["title", "content"]
     }
     
+    @ai_tool("Failed to create journal entry")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute journal entry creation"""
-        try:
-            from app.models.journal import JournalEntry
-            
-            # Parse entry date
-            entry_date = parameters.get("entry_date")
-            if entry_date:
-                entry_date = datetime.fromisoformat(entry_date).date()
-            else:
-                entry_date = datetime.now(timezone.utc).date()
-            
-            # Create journal entry directly
-            journal_entry = JournalEntry(
-                user_id=user.id,
-                title=parameters["title"],
-                content=parameters["content"],
-                mood=parameters.get("mood", "okay"),
-                entry_date=entry_date,
-                tags=[],
-                meta_data={},
-                is_private=False,
-                is_favorite=False
-            )
-            
-            session.add(journal_entry)
-            await session.commit()
-            await session.refresh(journal_entry)
-            
-            return {
-                "success": True,
-                "result": {
-                    "id": str(journal_entry.id),
-                    "title": journal_entry.title,
-                    "entry_date": journal_entry.entry_date.isoformat() if journal_entry.entry_date else None
-                },
-                "message": f"Created journal entry: {journal_entry.title}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating journal entry: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to create journal entry"
-            }
+        # Parse entry date
+        entry_date = _date_or_today(parameters.get("entry_date"))
+        
+        # Create journal entry directly, returning only what the response needs
+        statement = insert(JournalEntry).values(
+            user_id=user.id,
+            title=parameters["title"],
+            content=parameters["content"],
+            mood=parameters.get("mood", "okay"),
+            entry_date=entry_date,
+            tags=[],
+            meta_data={},
+            is_private=False
+        ).returning(JournalEntry.id, JournalEntry.title, JournalEntry.entry_date)
+        
+        async with _transaction(session):
+            result = await session.execute(statement)
+            journal_entry = result.one()
+        
+        return {
+            "success": True,
+            "id": journal_entry.id,
+            "title": journal_entry.title,
+            "entry_date": journal_entry.entry_date,
+            "message": f"Created journal entry: {journal_entry.title}"
+        }
 
 
 class CreateCalendarEventTool(AITool):
     """Tool for creating calendar events"""
     
-    name: str = "create_calendar_event"
-    description: str = "Create a new calendar event with title, description, and date/time"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "create_calendar_event"
+    description: ClassVar[str] = "Create a new calendar event with title, description, and date/time"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "title": {
@@ -191,70 +411,62 @@ class CreateCalendarEventTool(AITool):
         "required": ["title", "start_datetime"]
     }
     
+    @ai_tool("Failed to create calendar event")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute calendar event creation"""
-        try:
-            from app.models.calendar import CalendarEvent
-            from app.schemas.calendar import CalendarEventResponse
-            
-            # Parse dates
-            logger.info(f"AI Calendar Tool - Raw start_datetime parameter: {parameters.get('start_datetime')}")
-            start_datetime = datetime.fromisoformat(parameters["start_datetime"].replace('Z', '+00:00'))
-            logger.info(f"AI Calendar Tool - Parsed start_datetime: {start_datetime}")
-            
-            end_datetime = None
-            if parameters.get("end_datetime"):
-                end_datetime = datetime.fromisoformat(parameters["end_datetime"].replace('Z', '+00:00'))
-            else:
-                # Default to 1 hour duration if not specified
-                from datetime import timedelta
-                end_datetime = start_datetime + timedelta(hours=1)
-            
-            # Create calendar event directly
-            calendar_event = CalendarEvent(
-                user_id=user.id,
-                title=parameters["title"],
-                description=parameters.get("description", ""),
-                start_datetime=start_datetime,
-                end_datetime=end_datetime,
-                location=parameters.get("location"),
-                event_type="meeting",
-                color=get_random_calendar_color(),
-                meta_data={},
-                is_all_day=parameters.get("is_all_day", False),
-                is_recurring=False
-            )
-            
-            session.add(calendar_event)
-            await session.commit()
-            await session.refresh(calendar_event)
-            
-            return {
-                "success": True,
-                "result": {
-                    "id": str(calendar_event.id),
-                    "title": calendar_event.title,
-                    "start_datetime": calendar_event.start_datetime.isoformat(),
-                    "end_datetime": calendar_event.end_datetime.isoformat() if calendar_event.end_datetime else None
-                },
-                "message": f"Created calendar event: {calendar_event.title} for {start_datetime.strftime('%B %d, %Y at %I:%M %p')}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating calendar event: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to create calendar event"
-            }
+        # Parse dates
+        start_datetime = _parse_dt(parameters["start_datetime"])
+        logger.info(
+            "AI Calendar Tool - start_datetime raw=%s parsed=%s",
+            parameters["start_datetime"], start_datetime
+        )
+        
+        end_datetime = None
+        if parameters.get("end_datetime"):
+            end_datetime = _parse_dt(parameters["end_datetime"])
+        else:
+            # Default to 1 hour duration if not specified
+            end_datetime = start_datetime + timedelta(hours=1)
+        
+        # Create calendar event directly, returning only what the response needs
+        statement = insert(CalendarEvent).values(
+            user_id=user.id,
+            title=parameters["title"],
+            description=parameters.get("description", ""),
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            location=parameters.get("location"),
+            event_type="meeting",
+            color=get_random_calendar_color(),
+            meta_data={},
+            is_all_day=parameters.get("is_all_day", False)
+        ).returning(
+            CalendarEvent.id, CalendarEvent.title,
+            CalendarEvent.start_datetime, CalendarEvent.end_datetime
+        )
+        
+        async with _transaction(session):
+            result = await session.execute(statement)
+            calendar_event = result.one()
+        
+        return {
+            "success": True,
+            "id": calendar_event.id,
+            "title": calendar_event.title,
+            "start_datetime": calendar_event.start_datetime,
+            "end_datetime": calendar_event.end_datetime,
+            "message": f"Created calendar event: {calendar_event.title} for {_format_event_start(start_datetime)}"
+        }
 
 
 class EditCalendarEventTool(AITool):
     """Tool for editing existing calendar events"""
     
-    name: str = "edit_calendar_event"
-    description: str = "Edit an existing calendar event by changing title, time, description, or location"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "edit_calendar_event"
+    description: ClassVar[str] = "Edit an existing calendar event by changing title, time, description, or location"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "event_title": {
@@ -287,84 +499,87 @@ class EditCalendarEventTool(AITool):
         "required": ["event_title"]
     }
     
+    # (parameter, column, coercion) for each editable field
+    _FIELD_MAP: ClassVar[Tuple[Tuple[str, str, Optional[Callable[[str], Any]]], ...]] = (
+        ("new_title", "title", None),
+        ("new_description", "description", None),
+        ("new_location", "location", None),
+        ("new_start_datetime", "start_datetime", _parse_dt),
+        ("new_end_datetime", "end_datetime", _parse_dt),
+    )
+    # Fields that may be cleared by passing an empty string
+    _CLEARABLE_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"description", "location"})
+    
+    @ai_tool("Failed to edit calendar event")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute calendar event editing"""
-        try:
-            from app.models.calendar import CalendarEvent
-            from sqlmodel import select, and_
-            
-            event_title = parameters.get("event_title")
-            
-            # Find the event by title
-            statement = select(CalendarEvent).where(
-                and_(
-                    CalendarEvent.user_id == user.id,
-                    CalendarEvent.title.ilike(f"%{event_title}%")
-                )
-            ).order_by(CalendarEvent.start_datetime.desc())
-            
+        event_title = parameters.get("event_title")
+        
+        # Collect only the fields that were provided
+        changes: Dict[str, Any] = {}
+        for key, attr, coerce in self._FIELD_MAP:
+            value = parameters.get(key)
+            if value is None or (value == "" and attr not in self._CLEARABLE_FIELDS):
+                continue
+            changes[attr] = coerce(value) if coerce else value
+        
+        if "start_datetime" in changes and "end_datetime" not in changes:
+            # If only start time changed, maintain 1-hour duration
+            changes["end_datetime"] = changes["start_datetime"] + timedelta(hours=1)
+        
+        # Most recent event matching the title
+        match_id = select(CalendarEvent.id).where(
+            and_(
+                CalendarEvent.user_id == user.id,
+                CalendarEvent.title.ilike(f"%{_ilike_escape(event_title)}%", escape="\\")
+            )
+        ).order_by(CalendarEvent.start_datetime.desc()).limit(1)
+        
+        returned_columns = (
+            CalendarEvent.id, CalendarEvent.title,
+            CalendarEvent.start_datetime, CalendarEvent.end_datetime
+        )
+        if changes:
+            # Find and update in a single round-trip
+            statement = update(CalendarEvent).where(
+                CalendarEvent.id == match_id.scalar_subquery()
+            ).values(**changes).returning(
+                *returned_columns
+            ).execution_options(synchronize_session=False)
+        else:
+            statement = select(*returned_columns).where(
+                CalendarEvent.id == match_id.scalar_subquery()
+            )
+        
+        async with _transaction(session):
             result = await session.execute(statement)
-            events = result.scalars().all()
+            event = result.one_or_none()
             
-            if not events:
+            if event is None:
                 return {
                     "success": False,
                     "error": f"No calendar event found matching '{event_title}'",
                     "message": f"Could not find event '{event_title}'"
                 }
-            
-            # Use the first (most recent) match
-            event = events[0]
-            
-            # Update fields if provided
-            if parameters.get("new_title"):
-                event.title = parameters["new_title"]
-            
-            if parameters.get("new_start_datetime"):
-                event.start_datetime = datetime.fromisoformat(parameters["new_start_datetime"].replace('Z', '+00:00'))
-            
-            if parameters.get("new_end_datetime"):
-                event.end_datetime = datetime.fromisoformat(parameters["new_end_datetime"].replace('Z', '+00:00'))
-            elif parameters.get("new_start_datetime"):
-                # If only start time changed, maintain 1-hour duration
-                from datetime import timedelta
-                event.end_datetime = event.start_datetime + timedelta(hours=1)
-            
-            if parameters.get("new_description") is not None:
-                event.description = parameters["new_description"]
-            
-            if parameters.get("new_location") is not None:
-                event.location = parameters["new_location"]
-            
-            await session.commit()
-            await session.refresh(event)
-            
-            return {
-                "success": True,
-                "result": {
-                    "id": str(event.id),
-                    "title": event.title,
-                    "start_datetime": event.start_datetime.isoformat(),
-                    "end_datetime": event.end_datetime.isoformat() if event.end_datetime else None
-                },
-                "message": f"Updated calendar event: {event.title}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error editing calendar event: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to edit calendar event"
-            }
+        
+        return {
+            "success": True,
+            "id": event.id,
+            "title": event.title,
+            "start_datetime": event.start_datetime,
+            "end_datetime": event.end_datetime,
+            "message": f"Updated calendar event: {event.title}"
+        }
 
 
 class DeleteCalendarEventTool(AITool):
     """Tool for deleting calendar events"""
     
-    name: str = "delete_calendar_event"
-    description: str = "Delete a calendar event by title"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "delete_calendar_event"
+    description: ClassVar[str] = "Delete a calendar event by title"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "event_title": {
@@ -375,62 +590,45 @@ class DeleteCalendarEventTool(AITool):
         "required": ["event_title"]
     }
     
+    @ai_tool("Failed to delete calendar event")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute calendar event deletion"""
-        try:
-            from app.models.calendar import CalendarEvent
-            from sqlmodel import select, and_
-            
-            event_title = parameters.get("event_title")
-            
+        event_title = parameters.get("event_title")
+        
+        async with _transaction(session):
             # Find the event by title
-            statement = select(CalendarEvent).where(
-                and_(
-                    CalendarEvent.user_id == user.id,
-                    CalendarEvent.title.ilike(f"%{event_title}%")
-                )
-            ).order_by(CalendarEvent.start_datetime.desc())
-            
-            result = await session.execute(statement)
-            events = result.scalars().all()
+            result = await session.execute(
+                _FIND_EVENT_BY_TITLE,
+                {"user_id": user.id, "pattern": f"%{_ilike_escape(event_title)}%"}
+            )
+            event = result.scalar_one_or_none()
             
-            if not events:
+            if event is None:
                 return {
                     "success": False,
                     "error": f"No calendar event found matching '{event_title}'",
                     "message": f"Could not find event '{event_title}'"
                 }
             
-            # Delete the first (most recent) match
-            event = events[0]
             event_title_deleted = event.title
             
             await session.delete(event)
-            await session.commit()
-            
-            return {
-                "success": True,
-                "result": {
-                    "deleted_event": event_title_deleted
-                },
-                "message": f"Deleted calendar event: {event_title_deleted}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error deleting calendar event: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to delete calendar event"
-            }
+        
+        return {
+            "success": True,
+            "deleted_event": event_title_deleted,
+            "message": f"Deleted calendar event: {event_title_deleted}"
+        }
 
 
 class GetCalendarEventsTool(AITool):
     """Tool for getting calendar events"""
     
-    name: str = "get_calendar_events"
-    description: str = "Get calendar events for a specific date range or today"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "get_calendar_events"
+    description: ClassVar[str] = "Get calendar events for a specific date range or today"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "start_date": {
@@ -451,95 +649,83 @@ class GetCalendarEventsTool(AITool):
         "required": []
     }
     
+    @ai_tool("Failed to get calendar events")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute calendar events retrieval"""
-        try:
-            from app.models.calendar import CalendarEvent
-            from sqlmodel import select, and_
-            from datetime import date, datetime
-            
-            start_date_str = parameters.get("start_date")
-            end_date_str = parameters.get("end_date")
-            limit = parameters.get("limit", 20)
-            
-            # Parse dates
-            if start_date_str:
-                start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            else:
-                start_date = date.today()
-            
-            if end_date_str:
-                end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-            else:
-                end_date = start_date
-            
-            # Convert to datetime for comparison
-            start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-            end_datetime = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
-            
-            # Query events
-            statement = select(CalendarEvent).where(
-                and_(
-                    CalendarEvent.user_id == user.id,
-                    CalendarEvent.start_datetime >= start_datetime,
-                    CalendarEvent.start_datetime <= end_datetime
-                )
-            ).order_by(CalendarEvent.start_datetime).limit(limit)
-            
-            result = await session.execute(statement)
-            events = result.scalars().all()
-            
-            # Format events
-            events_list = []
-            for event in events:
-                # Convert UTC times to Eastern for display
-                start_eastern = event.start_datetime.astimezone(timezone.utc).strftime("%I:%M %p")
-                end_eastern = ""
-                if event.end_datetime:
-                    end_eastern = event.end_datetime.astimezone(timezone.utc).strftime("%I:%M %p")
-                
-                events_list.append({
-                    "id": str(event.id),
-                    "title": event.title,
-                    "description": event.description or "",
-                    "start_datetime": event.start_datetime.isoformat(),
-                    "end_datetime": event.end_datetime.isoformat() if event.end_datetime else None,
-                    "start_time_display": start_eastern,
-                    "end_time_display": end_eastern,
-                    "location": event.location or "",
-                    "is_all_day": event.is_all_day,
-                    "color": event.color
-                })
-            
-            date_range = start_date.isoformat()
-            if end_date != start_date:
-                date_range = f"{start_date.isoformat()} to {end_date.isoformat()}"
-            
-            return {
-                "success": True,
-                "events": events_list,
-                "summary": {
-                    "date_range": date_range,
-                    "total_events": len(events_list)
-                },
-                "message": f"Found {len(events_list)} events for {date_range}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting calendar events: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to get calendar events"
-            }
+        start_date_str = parameters.get("start_date")
+        end_date_str = parameters.get("end_date")
+        limit = parameters.get("limit", 20)
+        
+        # Parse dates
+        start_date = _date_or_today(start_date_str)
+        
+        if end_date_str:
+            end_date = _parse_date(end_date_str)
+        else:
+            end_date = start_date
+        
+        # Convert to datetime for comparison
+        start_datetime = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+        end_datetime = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+        
+        # Query events
+        async with _read_only(session):
+            result = await session.execute(
+                _SELECT_EVENTS_IN_RANGE,
+                {
+                    "user_id": user.id,
+                    "start_datetime": start_datetime,
+                    "end_datetime": end_datetime,
+                    "limit": limit
+                }
+            )
+            events = result.all()
+        
+        # Format events
+        events_list = []
+        for event in events:
+            # Convert UTC times to Eastern for display
+            start_eastern = _format_clock(event.start_datetime.astimezone(timezone.utc))
+            end_eastern = ""
+            if event.end_datetime:
+                end_eastern = _format_clock(event.end_datetime.astimezone(timezone.utc))
+            
+            events_list.append({
+                "id": event.id,
+                "title": event.title,
+                "description": event.description or "",
+                "start_datetime": event.start_datetime,
+                "end_datetime": event.end_datetime,
+                "start_time_display": start_eastern,
+                "end_time_display": end_eastern,
+                "location": event.location or "",
+                "is_all_day": event.is_all_day,
+                "color": event.color
+            })
+        
+        date_range = start_date.isoformat()
+        if end_date != start_date:
+            date_range = f"{start_date.isoformat()} to {end_date.isoformat()}"
+        
+        return {
+            "success": True,
+            "events": events_list,
+            "summary": {
+                "date_range": date_range,
+                "total_events": len(events_list)
+            },
+            "message": f"Found {len(events_list)} events for {date_range}"
+        }
 
 
 class CreateBoardTool(AITool):
     """Tool for creating boards"""
     
-    name: str = "create_board"
-    description: str = "Create a new Kanban board with title and description"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "create_board"
+    description: ClassVar[str] = "Create a new Kanban board with title and description"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "title": {
@@ -554,50 +740,39 @@ class CreateBoardTool(AITool):
         "required": ["title"]
     }
     
+    @ai_tool("Failed to create board")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute board creation"""
-        try:
-            from app.models.board import Board
-            
-            # Create board directly
-            board = Board(
-                user_id=user.id,
-                title=parameters["title"],
-                description=parameters.get("description", ""),
-                color=get_random_board_color(),
-                is_archived=False,
-                settings={}
-            )
-            
-            session.add(board)
-            await session.commit()
-            await session.refresh(board)
-            
-            return {
-                "success": True,
-                "result": {
-                    "id": str(board.id),
-                    "title": board.title,
-                    "description": board.description
-                },
-                "message": f"Created board: {board.title}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating board: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to create board"
-            }
+        # Create board directly, returning only what the response needs
+        statement = insert(Board).values(
+            user_id=user.id,
+            title=parameters["title"],
+            description=parameters.get("description", ""),
+            color=get_random_board_color(),
+            settings={}
+        ).returning(Board.id, Board.title, Board.description)
+        
+        async with _transaction(session):
+            result = await session.execute(statement)
+            board = result.one()
+        
+        return {
+            "success": True,
+            "id": board.id,
+            "title": board.title,
+            "description": board.description,
+            "message": f"Created board: {board.title}"
+        }
 
 
 class CreateCardTool(AITool):
     """Tool for creating cards on boards"""
     
-    name: str = "create_card"
-    description: str = "Create a new card on a specific board"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "create_card"
+    description: ClassVar[str] = "Create a new card on a specific board"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "board_id": {
@@ -625,56 +800,69 @@ class CreateCardTool(AITool):
         "required": ["board_id", "title"]
     }
     
+    @ai_tool("Failed to create card")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute card creation"""
-        try:
-            from app.models.board import Card
-            
-            # Parse due date if provided
-            due_date = None
-            if parameters.get("due_date"):
-                due_date = datetime.fromisoformat(parameters["due_date"]).date()
-            
-            # Create card directly
-            card = Card(
-                title=parameters["title"],
-                description=parameters.get("description", ""),
-                position=0,
-                status="todo",
-                priority="medium",
-                board_id=UUID(parameters["board_id"]),
-                meta_data={"due_date": due_date.isoformat() if due_date else None}
-            )
-            
-            session.add(card)
-            await session.commit()
-            await session.refresh(card)
-            
-            return {
-                "success": True,
-                "result": {
-                    "id": str(card.id),
-                    "title": card.title,
-                    "board_id": str(card.board_id)
-                },
-                "message": f"Created card: {card.title}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error creating card: {e}")
+        # Parse due date if provided
+        due_date = None
+        if parameters.get("due_date"):
+            due_date = _parse_date(parameters["due_date"])
+        
+        board_id = _uuid(parameters["board_id"])
+        
+        # card_metadata has no column default, so it is always written, starting
+        # from the same default shape the model gives cards created through the API
+        card_metadata: Dict[str, Any] = _CARD_METADATA_DEFAULT()
+        if due_date is not None:
+            card_metadata["due_date"] = due_date.isoformat()
+        
+        columns = ["board_id", "title", "description", "position", "status", "priority", "card_metadata"]
+        values = [
+            literal(board_id, Uuid),
+            literal(parameters["title"], String),
+            literal(parameters.get("description", ""), String),
+            literal(0, Integer),
+            literal("todo", String),
+            literal("medium", String),
+            literal(card_metadata, JSON)
+        ]
+        
+        # Insert the card only if the board belongs to the user, in one round trip
+        owned_board = select(*values).where(
+            exists().where(and_(Board.id == board_id, Board.user_id == user.id))
+        )
+        statement = insert(Card).from_select(columns, owned_board).returning(
+            Card.id, Card.title, Card.board_id
+        )
+        
+        async with _transaction(session):
+            result = await session.execute(statement)
+            card = result.one_or_none()
+        
+        if card is None:
             return {
                 "success": False,
-                "error": str(e),
-                "message": "Failed to create card"
+                "error": f"No board found with id '{board_id}'",
+                "message": "Could not find the board to add the card to"
             }
+        
+        return {
+            "success": True,
+            "id": card.id,
+            "title": card.title,
+            "board_id": card.board_id,
+            "message": f"Created card: {card.title}"
+        }
 
 
 class GetBoardsTool(AITool):
     """Tool for getting user boards"""
     
-    name: str = "get_boards"
-    description: str = "Get list of user's boards"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "get_boards"
+    description: ClassVar[str] = "Get list of user's boards"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "limit": {
@@ -685,51 +873,40 @@ class GetBoardsTool(AITool):
         }
     }
     
+    @ai_tool("Failed to get boards")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute get boards"""
-        try:
-            from app.models.board import Board
-            from sqlmodel import select
-            
-            limit = parameters.get("limit", 10)
-            
-            # Query boards directly
-            query = select(Board).where(Board.user_id == user.id).limit(limit)
-            result = await session.exec(query)
+        limit = parameters.get("limit", 10)
+        
+        # Query boards directly
+        async with _read_only(session):
+            result = await session.execute(_SELECT_BOARDS, {"user_id": user.id, "limit": limit})
             boards = result.all()
-            
-            boards_list = []
-            for board in boards:
-                boards_list.append({
-                    "id": str(board.id),
-                    "title": board.title,
-                    "description": board.description
-                })
-            
-            return {
-                "success": True,
-                "result": {
-                    "boards": boards_list,
-                    "total": len(boards_list)
-                },
-                "message": f"Found {len(boards_list)} boards"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting boards: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to get boards"
-            }
+        
+        boards_list = []
+        for board in boards:
+            boards_list.append({
+                "id": board.id,
+                "title": board.title,
+                "description": board.description
+            })
+        
+        return {
+            "success": True,
+            "boards": boards_list,
+            "total": len(boards_list),
+            "message": f"Found {len(boards_list)} boards"
+        }
 
 
 class CreateQuestTool(AITool):
     """Tool for creating quest tasks"""
     
-    name: str = "create_quest"
-    description: str = "Create a new quest (daily task) with content and optional due date/time"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "create_quest"
+    description: ClassVar[str] = "Create a new quest (daily task) with content and optional due date/time"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "content": {
@@ -755,79 +932,72 @@ class CreateQuestTool(AITool):
         "required": ["content"]
     }
     
+    @ai_tool("Failed to create quest")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-        try:
-            from app.models.quest import Quest
-            from datetime import date, datetime, timezone
-            from sqlmodel import select, func, and_
-            
-            content = parameters.get("content")
-            date_created = parameters.get("date_created")
-            date_due = parameters.get("date_due")
-            time_due = parameters.get("time_due")
-            
-            # Parse dates
-            if date_created:
-                quest_date = datetime.strptime(date_created, "%Y-%m-%d").date()
-            else:
-                quest_date = date.today()
-                
-            due_date = None
-            if date_due:
-                due_date = datetime.strptime(date_due, "%Y-%m-%d").date()
-            
-            # Get next order index
-            max_order_stmt = select(func.coalesce(func.max(Quest.order_index), 0)).where(
-                and_(Quest.user_id == user.id, Quest.date_created == quest_date)
-            )
-            result = await session.execute(max_order_stmt)
-            max_order = result.scalar() or 0
-            
-            # Create quest
-            quest = Quest(
-                user_id=user.id,
-                content=content,
-                date_created=quest_date,
-                date_due=due_date,
-                time_due=time_due,
-                order_index=max_order + 1
-            )
-            
-            session.add(quest)
-            await session.commit()
-            await session.refresh(quest)
-            
-            logger.info(f"Quest created via AI: {quest.id} for user {user.id}")
-            
-            return {
-                "success": True,
-                "quest": {
-                    "id": str(quest.id),
-                    "content": quest.content,
-                    "date_created": quest.date_created.isoformat(),
-                    "date_due": quest.date_due.isoformat() if quest.date_due else None,
-                    "time_due": quest.time_due,
-                    "is_complete": quest.is_complete
-                },
-                "message": f"Quest created for {quest_date}: {content}"
-            }
-            
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Error creating quest via AI: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to create quest"
-            }
+        content = parameters.get("content")
+        date_created = parameters.get("date_created")
+        date_due = parameters.get("date_due")
+        time_due = parameters.get("time_due")
+        
+        # Parse dates
+        quest_date = _date_or_today(date_created)
+        
+        due_date = None
+        if date_due:
+            due_date = _parse_date(date_due)
+        
+        # Insert with the next order index computed in the same statement
+        next_order = select(
+            literal(user.id, Uuid),
+            literal(content, String),
+            literal(quest_date, Date),
+            literal(due_date, Date),
+            literal(time_due, String),
+            func.coalesce(func.max(Quest.order_index), 0) + 1
+        ).where(
+            and_(Quest.user_id == user.id, Quest.date_created == quest_date)
+        )
+        statement = insert(Quest).from_select(
+            ["user_id", "content", "date_created", "date_due", "time_due", "order_index"],
+            next_order
+        ).returning(
+            Quest.id, Quest.content, Quest.date_created, Quest.date_due,
+            Quest.time_due, Quest.is_complete
+        )
+        
+        async with _transaction(session):
+            # Under READ COMMITTED two concurrent inserts can read the same
+            # max(order_index); serialize creates for this user's day until commit
+            await session.execute(select(func.pg_advisory_xact_lock(
+                func.hashtext(f"quest_order:{user.id}:{quest_date.isoformat()}")
+            )))
+            result = await session.execute(statement)
+            quest = result.one()
+        
+        logger.info("Quest created via AI: %s for user %s", quest.id, user.id)
+        
+        return {
+            "success": True,
+            "quest": {
+                "id": quest.id,
+                "content": quest.content,
+                "date_created": quest.date_created,
+                "date_due": quest.date_due,
+                "time_due": quest.time_due,
+                "is_complete": quest.is_complete
+            },
+            "message": f"Quest created for {quest_date}: {content}"
+        }
 
 
 class CompleteQuestTool(AITool):
     """Tool for completing/marking quest tasks as done"""
     
-    name: str = "complete_quest"
-    description: str = "Mark a quest task as complete or incomplete"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "complete_quest"
+    description: ClassVar[str] = "Mark a quest task as complete or incomplete"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "quest_content": {
@@ -847,80 +1017,63 @@ class CompleteQuestTool(AITool):
         "required": ["quest_content"]
     }
     
+    @ai_tool("Failed to update quest")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-        try:
-            from app.models.quest import Quest
-            from datetime import date, datetime, timezone
-            from sqlmodel import select, and_
-            
-            quest_content = parameters.get("quest_content")
-            quest_date_str = parameters.get("quest_date")
-            is_complete = parameters.get("is_complete", True)
-            
-            # Parse date
-            if quest_date_str:
-                quest_date = datetime.strptime(quest_date_str, "%Y-%m-%d").date()
-            else:
-                quest_date = date.today()
-            
-            # Find quest by content (fuzzy match)
-            statement = select(Quest).where(
-                and_(
-                    Quest.user_id == user.id,
-                    Quest.date_created == quest_date,
-                    Quest.content.ilike(f"%{quest_content}%")
-                )
-            ).order_by(Quest.order_index)
-            
+        quest_content = parameters.get("quest_content")
+        quest_date_str = parameters.get("quest_date")
+        is_complete = parameters.get("is_complete", True)
+        
+        quest_date = _date_or_today(quest_date_str)
+        
+        # Find quest by content (fuzzy match) and update it in one statement
+        match_id = select(Quest.id).where(
+            _quest_match(user.id, quest_date, quest_content)
+        ).order_by(Quest.order_index).limit(1)
+        
+        now = datetime.now(timezone.utc)
+        statement = update(Quest).where(
+            Quest.id == match_id.scalar_subquery()
+        ).values(
+            is_complete=is_complete,
+            completed_at=now if is_complete else None,
+            updated_at=now
+        ).returning(
+            Quest.id, Quest.content, Quest.is_complete, Quest.completed_at
+        ).execution_options(synchronize_session=False)
+        
+        async with _transaction(session):
             result = await session.execute(statement)
-            quests = result.scalars().all()
+            quest = result.one_or_none()
             
-            if not quests:
+            if quest is None:
                 return {
                     "success": False,
                     "message": f"No quest found matching '{quest_content}' for {quest_date}"
                 }
-            
-            # Use the first match
-            quest = quests[0]
-            
-            if is_complete:
-                quest.mark_complete()
-            else:
-                quest.mark_incomplete()
-            
-            await session.commit()
-            
-            status = "completed" if is_complete else "marked as incomplete"
-            logger.info(f"Quest {status} via AI: {quest.id} for user {user.id}")
-            
-            return {
-                "success": True,
-                "quest": {
-                    "id": str(quest.id),
-                    "content": quest.content,
-                    "is_complete": quest.is_complete,
-                    "completed_at": quest.completed_at.isoformat() if quest.completed_at else None
-                },
-                "message": f"Quest '{quest.content}' {status}"
-            }
-            
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Error completing quest via AI: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to update quest"
-            }
+        
+        status = "completed" if is_complete else "marked as incomplete"
+        logger.info("Quest %s via AI: %s for user %s", status, quest.id, user.id)
+        
+        return {
+            "success": True,
+            "quest": {
+                "id": quest.id,
+                "content": quest.content,
+                "is_complete": quest.is_complete,
+                "completed_at": quest.completed_at
+            },
+            "message": f"Quest '{quest.content}' {status}"
+        }
 
 
 class GetQuestsTool(AITool):
     """Tool for getting quest tasks for a specific date"""
     
-    name: str = "get_quests"
-    description: str = "Get quest tasks for a specific date or today"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "get_quests"
+    description: ClassVar[str] = "Get quest tasks for a specific date or today"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "quest_date": {
@@ -931,84 +1084,82 @@ class GetQuestsTool(AITool):
             "include_completed": {
                 "type": "boolean",
                 "description": "Whether to include completed quests (default: true)"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of quests to return (default: 100)",
+                "minimum": 1
             }
         },
         "required": []
     }
     
+    @ai_tool("Failed to get quests")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-        try:
-            from app.models.quest import Quest
-            from datetime import date, datetime
-            from sqlmodel import select, and_
-            
-            quest_date_str = parameters.get("quest_date")
-            include_completed = parameters.get("include_completed", True)
-            
-            # Parse date
-            if quest_date_str:
-                quest_date = datetime.strptime(quest_date_str, "%Y-%m-%d").date()
-            else:
-                quest_date = date.today()
-            
-            # Build query
-            conditions = [
-                Quest.user_id == user.id,
-                Quest.date_created == quest_date
-            ]
-            
-            if not include_completed:
-                conditions.append(Quest.is_complete == False)
-            
-            statement = select(Quest).where(and_(*conditions)).order_by(Quest.order_index)
+        quest_date_str = parameters.get("quest_date")
+        include_completed = parameters.get("include_completed", True)
+        limit = parameters.get("limit", 100)
+        
+        quest_date = _date_or_today(quest_date_str)
+        
+        # Build query
+        conditions = [
+            Quest.user_id == user.id,
+            Quest.date_created == quest_date
+        ]
+        
+        if not include_completed:
+            conditions.append(Quest.is_complete.is_(False))
+        
+        # Window counts are taken over every matching quest, before the LIMIT
+        statement = select(
+            Quest.id, Quest.content, Quest.is_complete, Quest.date_due,
+            Quest.time_due, Quest.order_index,
+            func.count().over().label("total"),
+            func.count().filter(Quest.is_complete).over().label("completed")
+        ).where(and_(*conditions)).order_by(Quest.order_index).limit(limit)
+        async with _read_only(session):
             result = await session.execute(statement)
-            quests = result.scalars().all()
-            
-            # Format quests
-            quests_list = []
-            completed_count = 0
-            for quest in quests:
-                if quest.is_complete:
-                    completed_count += 1
-                    
-                quests_list.append({
-                    "id": str(quest.id),
-                    "content": quest.content,
-                    "is_complete": quest.is_complete,
-                    "date_due": quest.date_due.isoformat() if quest.date_due else None,
-                    "time_due": quest.time_due,
-                    "order_index": quest.order_index
-                })
-            
-            logger.info(f"Retrieved {len(quests)} quests for {quest_date} via AI for user {user.id}")
-            
-            return {
-                "success": True,
-                "quests": quests_list,
-                "summary": {
-                    "date": quest_date.isoformat(),
-                    "total": len(quests_list),
-                    "completed": completed_count,
-                    "pending": len(quests_list) - completed_count
-                },
-                "message": f"Found {len(quests_list)} quests for {quest_date}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting quests via AI: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to get quests"
-            }
+            rows = result.all()
+        
+        # The window counts ride along on every row, so the summary comes from
+        # the same rows that are listed
+        quests_list = []
+        total = completed_count = 0
+        for row in rows:
+            total, completed_count = row.total, row.completed
+            quests_list.append({
+                "id": row.id,
+                "content": row.content,
+                "is_complete": row.is_complete,
+                "date_due": row.date_due,
+                "time_due": row.time_due,
+                "order_index": row.order_index
+            })
+        
+        logger.info("Retrieved %d quests for %s via AI for user %s", len(quests_list), quest_date, user.id)
+        
+        return {
+            "success": True,
+            "quests": quests_list,
+            "summary": {
+                "date": quest_date,
+                "total": total,
+                "completed": completed_count,
+                "pending": total - completed_count
+            },
+            "message": f"Found {len(quests_list)} quests for {quest_date}"
+        }
 
 
 class EditQuestTool(AITool):
     """Tool for editing existing quest tasks"""
     
-    name: str = "edit_quest"
-    description: str = "Edit an existing quest task by changing content, due date, or time"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "edit_quest"
+    description: ClassVar[str] = "Edit an existing quest task by changing content, due date, or time"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "quest_content": {
@@ -1038,84 +1189,64 @@ class EditQuestTool(AITool):
         "required": ["quest_content"]
     }
     
+    @ai_tool("Failed to edit quest")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-        try:
-            from app.models.quest import Quest
-            from datetime import date, datetime
-            from sqlmodel import select, and_
-            
-            quest_content = parameters.get("quest_content")
-            quest_date_str = parameters.get("quest_date")
-            
-            # Parse date
-            if quest_date_str:
-                quest_date = datetime.strptime(quest_date_str, "%Y-%m-%d").date()
-            else:
-                quest_date = date.today()
-            
-            # Find quest by content
-            statement = select(Quest).where(
-                and_(
-                    Quest.user_id == user.id,
-                    Quest.date_created == quest_date,
-                    Quest.content.ilike(f"%{quest_content}%")
-                )
-            ).order_by(Quest.order_index)
-            
+        quest_content = parameters.get("quest_content")
+        quest_date_str = parameters.get("quest_date")
+        
+        quest_date = _date_or_today(quest_date_str)
+        
+        # Only overwrite the fields the model actually provided
+        changes: Dict[str, Any] = {"updated_at": datetime.now(timezone.utc)}
+        if parameters.get("new_content"):
+            changes["content"] = parameters["new_content"]
+        if parameters.get("new_date_due"):
+            changes["date_due"] = _parse_date(parameters["new_date_due"])
+        if parameters.get("new_time_due"):
+            changes["time_due"] = parameters["new_time_due"]
+        
+        # Find quest by content and update it in one statement
+        match_id = select(Quest.id).where(
+            _quest_match(user.id, quest_date, quest_content)
+        ).order_by(Quest.order_index).limit(1)
+        statement = update(Quest).where(
+            Quest.id == match_id.scalar_subquery()
+        ).values(**changes).returning(
+            Quest.id, Quest.content, Quest.date_due, Quest.time_due, Quest.is_complete
+        ).execution_options(synchronize_session=False)
+        
+        async with _transaction(session):
             result = await session.execute(statement)
-            quests = result.scalars().all()
-            
-            if not quests:
-                return {
-                    "success": False,
-                    "error": f"No quest found matching '{quest_content}' for {quest_date}",
-                    "message": f"Could not find quest matching '{quest_content}'"
-                }
-            
-            # Use the first match
-            quest = quests[0]
-            
-            # Update fields if provided
-            if parameters.get("new_content"):
-                quest.content = parameters["new_content"]
-            
-            if parameters.get("new_date_due"):
-                quest.date_due = datetime.strptime(parameters["new_date_due"], "%Y-%m-%d").date()
-            
-            if parameters.get("new_time_due"):
-                quest.time_due = parameters["new_time_due"]
-            
-            await session.commit()
-            await session.refresh(quest)
-            
-            return {
-                "success": True,
-                "quest": {
-                    "id": str(quest.id),
-                    "content": quest.content,
-                    "date_due": quest.date_due.isoformat() if quest.date_due else None,
-                    "time_due": quest.time_due,
-                    "is_complete": quest.is_complete
-                },
-                "message": f"Updated quest: {quest.content}"
-            }
-            
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Error editing quest via AI: {e}")
+            quest = result.one_or_none()
+        
+        if quest is None:
             return {
                 "success": False,
-                "error": str(e),
-                "message": "Failed to edit quest"
+                "error": f"No quest found matching '{quest_content}' for {quest_date}",
+                "message": f"Could not find quest matching '{quest_content}'"
             }
+        
+        return {
+            "success": True,
+            "quest": {
+                "id": quest.id,
+                "content": quest.content,
+                "date_due": quest.date_due,
+                "time_due": quest.time_due,
+                "is_complete": quest.is_complete
+            },
+            "message": f"Updated quest: {quest.content}"
+        }
 
 
 class DeleteQuestTool(AITool):
     """Tool for deleting quest tasks"""
     
-    name: str = "delete_quest"
-    description: str = "Delete a quest task by content"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "delete_quest"
+    description: ClassVar[str] = "Delete a quest task by content"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "quest_content": {
@@ -1131,71 +1262,107 @@ class DeleteQuestTool(AITool):
         "required": ["quest_content"]
     }
     
+    @ai_tool("Failed to delete quest")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-        try:
-            from app.models.quest import Quest
-            from datetime import date, datetime
-            from sqlmodel import select, and_
-            
-            quest_content = parameters.get("quest_content")
-            quest_date_str = parameters.get("quest_date")
-            
-            # Parse date
-            if quest_date_str:
-                quest_date = datetime.strptime(quest_date_str, "%Y-%m-%d").date()
-            else:
-                quest_date = date.today()
-            
-            # Find quest by content
-            statement = select(Quest).where(
-                and_(
-                    Quest.user_id == user.id,
-                    Quest.date_created == quest_date,
-                    Quest.content.ilike(f"%{quest_content}%")
-                )
-            ).order_by(Quest.order_index)
-            
+        quest_content = parameters.get("quest_content")
+        quest_date_str = parameters.get("quest_date")
+        
+        quest_date = _date_or_today(quest_date_str)
+        
+        # Find quest by content and delete it in one statement
+        match_id = select(Quest.id).where(
+            _quest_match(user.id, quest_date, quest_content)
+        ).order_by(Quest.order_index).limit(1)
+        statement = delete(Quest).where(
+            Quest.id == match_id.scalar_subquery()
+        ).returning(Quest.content).execution_options(synchronize_session=False)
+        
+        async with _transaction(session):
             result = await session.execute(statement)
-            quests = result.scalars().all()
-            
-            if not quests:
-                return {
-                    "success": False,
-                    "error": f"No quest found matching '{quest_content}' for {quest_date}",
-                    "message": f"Could not find quest matching '{quest_content}'"
-                }
-            
-            # Delete the first match
-            quest = quests[0]
-            quest_content_deleted = quest.content
-            
-            await session.delete(quest)
-            await session.commit()
-            
-            return {
-                "success": True,
-                "result": {
-                    "deleted_quest": quest_content_deleted
-                },
-                "message": f"Deleted quest: {quest_content_deleted}"
-            }
-            
-        except Exception as e:
-            await session.rollback()
-            logger.error(f"Error deleting quest via AI: {e}")
+            quest_content_deleted = result.scalar_one_or_none()
+        
+        if quest_content_deleted is None:
             return {
                 "success": False,
-                "error": str(e),
-                "message": "Failed to delete quest"
+                "error": f"No quest found matching '{quest_content}' for {quest_date}",
+                "message": f"Could not find quest matching '{quest_content}'"
             }
+        
+        return {
+            "success": True,
+            "deleted_quest": quest_content_deleted,
+            "message": f"Deleted quest: {quest_content_deleted}"
+        }
+
+
+_SERPER_SEARCH_URL = "https://google.serper.dev/search"
+
+# Shared so searches reuse pooled keep-alive connections to Serper, with
+# concurrent searches multiplexed over one HTTP/2 connection
+_SERPER_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+    headers={'Content-Type': 'application/json'}
+)
+
+# Recent successful searches, keyed on (normalized query, num_results), so the
+# model re-asking the same question within a chat doesn't re-hit Serper.
+# Responses are kept as orjson bytes so every caller decodes its own copy.
+_SEARCH_CACHE_TTL = 300.0
+_SEARCH_CACHE_MAX_SIZE = 1024
+_SEARCH_CACHE: "OrderedDict[Tuple[str, int], Tuple[float, bytes]]" = OrderedDict()
+
+# Searches in flight, so concurrent identical searches share one Serper request.
+# Waiters hold the future itself, so dropping the entry never strands them.
+_SEARCH_INFLIGHT: "Dict[Tuple[str, int], asyncio.Future[bytes]]" = {}
+
+
+def _search_cache_get(key: Tuple[str, int]) -> Optional[bytes]:
+    """Return a cached, serialized search response if it hasn't expired"""
+    entry = _SEARCH_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at < time.monotonic():
+        del _SEARCH_CACHE[key]
+        return None
+    return response
+
+
+def _search_cache_put(key: Tuple[str, int], response: bytes) -> None:
+    """Cache a serialized search response, evicting the oldest entry when full"""
+    _SEARCH_CACHE[key] = (time.monotonic() + _SEARCH_CACHE_TTL, response)
+    _SEARCH_CACHE.move_to_end(key)
+    if len(_SEARCH_CACHE) > _SEARCH_CACHE_MAX_SIZE:
+        _SEARCH_CACHE.popitem(last=False)
+
+
+# Only these parts of Serper's answer box and knowledge graph are passed on to the model
+_ANSWER_BOX_FIELDS = ("title", "answer", "snippet", "link")
+_KNOWLEDGE_GRAPH_FIELDS = ("title", "type", "description", "website", "attributes")
+
+
+def _pick_fields(section: Optional[Dict[str, Any]], fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """Shallow-copy just the given keys of a Serper result section"""
+    if not section:
+        return None
+    return {field: section[field] for field in fields if field in section}
+
+
+async def close_http_clients() -> None:
+    """Close the HTTP clients shared by the AI tools"""
+    await _SERPER_CLIENT.aclose()
 
 
 class InternetSearchTool(AITool):
     """Tool for searching the internet using Serper API"""
     
-    name: str = "search_internet"
-    description: str = "Search the internet for current information, news, facts, or answers to questions"
-    parameters: Dict[str, Any] = {
+    __slots__ = ()
+    
+    name: ClassVar[str] = "search_internet"
+    description: ClassVar[str] = "Search the internet for current information, news, facts, or answers to questions"
+    parameters: ClassVar[Dict[str, Any]] = {
         "type": "object",
         "properties": {
             "query": {
@@ -1212,134 +1379,204 @@ class InternetSearchTool(AITool):
         },
         "required": ["query"]
     }
+    concurrent: ClassVar[bool] = True
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        """Only offer search when a Serper API key is configured"""
+        return bool(settings.serper_api_key)
     
+    @ai_tool("Failed to perform internet search")
     async def execute(self, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
         """Execute internet search using Serper API"""
         try:
-            if not settings.serper_api_key:
-                return {
-                    "success": False,
-                    "error": "Internet search not available - Serper API key not configured",
-                    "message": "Internet search functionality is not configured"
-                }
-            
-            import httpx
-            
             query = parameters.get("query")
             num_results = min(parameters.get("num_results", 5), 10)
             
-            # Prepare Serper API request
-            url = "https://google.serper.dev/search"
-            headers = {
-                'X-API-KEY': settings.serper_api_key,
-                'Content-Type': 'application/json'
-            }
-            payload = {
-                "q": query,
-                "num": num_results
-            }
-            
-            # Make the API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                results = response.json()
-            
-            # Extract organic search results
-            organic_results = results.get("organic", [])
-            
-            # Format results for the AI
-            search_results = []
-            for result in organic_results[:num_results]:
-                search_results.append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", ""),
-                    "position": result.get("position", 0)
-                })
-            
-            # Also include answer box and knowledge graph if available
-            answer_box = results.get("answerBox")
-            knowledge_graph = results.get("knowledgeGraph")
-            
-            return {
-                "success": True,
-                "result": {
-                    "query": query,
-                    "search_results": search_results,
-                    "answer_box": answer_box,
-                    "knowledge_graph": knowledge_graph,
-                    "results_count": len(search_results),
-                    "search_time": results.get("searchInformation", {}).get("searchTime")
-                },
-                "message": f"Found {len(search_results)} search results for '{query}'"
-            }
+            key = (query.strip().lower(), num_results)
+            cached = _search_cache_get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+            
+            # Concurrent identical searches wait for the first one's result
+            inflight = _SEARCH_INFLIGHT.get(key)
+            if inflight is not None:
+                return orjson.loads(await asyncio.shield(inflight))
+            
+            inflight = asyncio.get_running_loop().create_future()
+            _SEARCH_INFLIGHT[key] = inflight
+            try:
+                response = await self._search(query, num_results)
+                serialized = orjson.dumps(response)
+                _search_cache_put(key, serialized)
+                inflight.set_result(serialized)
+                return response
+            except asyncio.CancelledError:
+                inflight.cancel()
+                raise
+            except Exception as e:
+                inflight.set_exception(e)
+                # Mark the exception retrieved in case nobody was waiting
+                inflight.exception()
+                raise
+            finally:
+                del _SEARCH_INFLIGHT[key]
             
         except httpx.RequestError as e:
-            logger.error(f"Network error in internet search: {e}")
+            logger.error("Network error in internet search: %s", e)
             return {
                 "success": False,
                 "error": f"Network error: {str(e)}",
                 "message": "Failed to connect to search service"
             }
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error in internet search: {e}")
+            logger.error("HTTP error in internet search: %s", e)
             return {
                 "success": False,
                 "error": f"Search API error: {e.response.status_code}",
                 "message": "Search service returned an error"
             }
-        except Exception as e:
-            logger.error(f"Error in internet search: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Failed to perform internet search"
-            }
+    
+    async def _search(self, query: str, num_results: int) -> Dict[str, Any]:
+        """Query Serper and format the results for the AI"""
+        # Prepare Serper API request
+        headers = {'X-API-KEY': settings.serper_api_key}
+        payload = {
+            "q": query,
+            "num": num_results
+        }
+        
+        # Make the API request
+        response = await _SERPER_CLIENT.post(_SERPER_SEARCH_URL, json=payload, headers=headers)
+        response.raise_for_status()
+        results = orjson.loads(response.content)
+        
+        # Extract organic search results
+        organic_results = results.get("organic", [])
+        
+        # Format results for the AI
+        search_results = []
+        for result in organic_results[:num_results]:
+            search_results.append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", ""),
+                "position": result.get("position", 0)
+            })
+        
+        # Also include answer box and knowledge graph if available
+        answer_box = _pick_fields(results.get("answerBox"), _ANSWER_BOX_FIELDS)
+        knowledge_graph = _pick_fields(results.get("knowledgeGraph"), _KNOWLEDGE_GRAPH_FIELDS)
+        
+        return {
+            "success": True,
+            "query": query,
+            "search_results": search_results,
+            "answer_box": answer_box,
+            "knowledge_graph": knowledge_graph,
+            "results_count": len(search_results),
+            "search_time": results.get("searchInformation", {}).get("searchTime"),
+            "message": f"Found {len(search_results)} search results for '{query}'"
+        }
+
+
+@lru_cache(maxsize=None)
+def _registry() -> Mapping[str, AITool]:
+    """Build the tool registry once; the read-only view guards the cached schemas below"""
+    return MappingProxyType({
+        name: tool_cls() for name, tool_cls in _TOOL_CLASSES.items() if tool_cls.is_available()
+    })
 
 
 # Registry of available tools
-AI_TOOLS_REGISTRY: Dict[str, AITool] = {
-    "create_journal_entry": CreateJournalEntryTool(),
-    "create_calendar_event": CreateCalendarEventTool(),
-    "edit_calendar_event": EditCalendarEventTool(),
-    "delete_calendar_event": DeleteCalendarEventTool(),
-    "get_calendar_events": GetCalendarEventsTool(),
-    "create_board": CreateBoardTool(),
-    "create_card": CreateCardTool(),
-    "get_boards": GetBoardsTool(),
-    "create_quest": CreateQuestTool(),
-    "complete_quest": CompleteQuestTool(),
-    "edit_quest": EditQuestTool(),
-    "delete_quest": DeleteQuestTool(),
-    "get_quests": GetQuestsTool(),
-    "search_internet": InternetSearchTool()
-}
+AI_TOOLS_REGISTRY: Mapping[str, AITool] = _registry()
+
+# Tools whose consecutive calls in one turn can be run together
+_CONCURRENT_TOOLS: FrozenSet[str] = frozenset(
+    name for name, tool in AI_TOOLS_REGISTRY.items() if tool.concurrent
+)
+
+# Bound execute methods, so dispatch is a single lookup
+_TOOL_EXECUTORS: Mapping[str, _ToolExecute] = MappingProxyType(
+    {name: tool.execute for name, tool in AI_TOOLS_REGISTRY.items()}
+)
+
+
+def _build_tools_for_openai() -> List[Dict[str, Any]]:
+    """Build the OpenAI function calling payload from the registry"""
+    return [tool.openai_spec for tool in AI_TOOLS_REGISTRY.values()]
+
+
+# Tool schemas are static, so build the list once at import time
+_OPENAI_TOOLS_CACHED: List[Dict[str, Any]] = _build_tools_for_openai()
 
 
 def get_tools_for_openai() -> List[Dict[str, Any]]:
     """Get tools formatted for OpenAI function calling"""
-    tools = []
-    for tool in AI_TOOLS_REGISTRY.values():
-        tools.append({
-            "type": "function",
-            "function": {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.parameters
-            }
-        })
-    return tools
+    return _OPENAI_TOOLS_CACHED
 
 
 async def execute_ai_tool(tool_name: str, parameters: Dict[str, Any], user: User, session) -> Dict[str, Any]:
-    """Execute an AI tool by name"""
-    if tool_name not in AI_TOOLS_REGISTRY:
+    """Execute an AI tool by name
+
+    The returned dict is built by trusted server code, so callers wrapping it in
+    a response model can use model_construct rather than validating it again.
+    """
+    execute = _TOOL_EXECUTORS.get(tool_name)
+    if execute is None:
         return {
             "success": False,
             "error": f"Unknown tool: {tool_name}",
             "message": f"Tool '{tool_name}' is not available"
         }
     
-    tool = AI_TOOLS_REGISTRY[tool_name]
-    return await tool.execute(parameters, user, session)
\ No newline at end of file
+    try:
+        _COMPILED_PARAM_VALIDATORS[tool_name](parameters)
+    except fastjsonschema.JsonSchemaException as e:
+        return {
+            "success": False,
+            "error": f"Invalid parameters: {e.message}",
+            "message": f"Tool '{tool_name}' received invalid parameters"
+        }
+    
+    return await execute(parameters, user, session)
+
+
+async def _execute_batch(
+    calls: List[Tuple[str, Dict[str, Any]]], user: User, session
+) -> List[Dict[str, Any]]:
+    """Run session-bound tool calls in one transaction, replaying them one by one if any fails"""
+    if len(calls) > 1:
+        try:
+            async with _transaction(session):
+                token = _in_batch.set(True)
+                try:
+                    return [
+                        await execute_ai_tool(tool_name, parameters, user, session)
+                        for tool_name, parameters in calls
+                    ]
+                finally:
+                    _in_batch.reset(token)
+        except (SQLAlchemyError, ValueError) as e:
+            # Same failures ai_tool turns into error results; anything else is a bug
+            logger.warning("Batched tool calls failed, retrying one by one: %s", e)
+    return [await execute_ai_tool(tool_name, parameters, user, session) for tool_name, parameters in calls]
+
+
+async def execute_ai_tools(
+    calls: List[Tuple[str, Dict[str, Any]]], user: User, session
+) -> List[Dict[str, Any]]:
+    """Execute one turn's tool calls in order
+    
+    Consecutive concurrent-safe calls run together, and consecutive
+    session-bound calls share one transaction and a single commit.
+    """
+    results: List[Dict[str, Any]] = []
+    for concurrent, group in itertools.groupby(calls, key=lambda call: call[0] in _CONCURRENT_TOOLS):
+        if concurrent:
+            results.extend(await asyncio.gather(
+                *(execute_ai_tool(tool_name, parameters, user, session) for tool_name, parameters in group)
+            ))
+        else:
+            results.extend(await _execute_batch(list(group), user, session))
+    return results
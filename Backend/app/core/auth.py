@@ -1,15 +1,20 @@
 """
 Authentication and authorization utilities
 """
+import hashlib
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Tuple
 from uuid import UUID
 
+import bcrypt
 from fastapi import HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -17,12 +22,15 @@ from app.config import settings
 from app.database import get_session
 from app.models.user import User, UserSession
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by the raw token, so a client reusing its access
+# token skips the signature check. Entries never outlive the token's own exp.
+_TOKEN_CACHE_TTL = 30.0
+_TOKEN_CACHE_MAX_SIZE = 4096
+_TOKEN_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
 
 class AuthenticationError(HTTPException):
     """Custom authentication error"""
@@ -45,6 +53,11 @@ class AuthorizationError(HTTPException):
         )
 
 
+# bcrypt only uses the first 72 bytes of a password; passlib truncated silently,
+# while bcrypt 5 raises, so the cut is made explicitly to keep existing hashes valid
+_BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
@@ -56,7 +69,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES],
+        hashed_password.encode("utf-8")
+    )
 
 
 def get_password_hash(password: str) -> str:
@@ -69,7 +85,8 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: The hashed password
     """
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES], salt).decode("utf-8")
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -137,15 +154,34 @@ def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     Raises:
         AuthenticationError: If token is invalid
     """
+    entry = _TOKEN_CACHE.get(token)
+    if entry is not None:
+        expires_at, payload = entry
+        if expires_at > time.time():
+            _TOKEN_CACHE.move_to_end(token)
+            if payload.get("type") != token_type:
+                raise AuthenticationError("Invalid token type")
+            return payload
+        _TOKEN_CACHE.pop(token, None)
+    
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        
-        if payload.get("type") != token_type:
-            raise AuthenticationError("Invalid token type")
-        
-        return payload
     except JWTError:
         raise AuthenticationError("Invalid token")
+    
+    # Only signature-checked payloads are cached; a bad token always re-verifies
+    expires_at = time.time() + _TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    _TOKEN_CACHE[token] = (expires_at, payload)
+    if len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX_SIZE:
+        _TOKEN_CACHE.popitem(last=False)
+    
+    if payload.get("type") != token_type:
+        raise AuthenticationError("Invalid token type")
+    
+    return payload
 
 
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
@@ -200,7 +236,9 @@ async def authenticate_user(session: AsyncSession, email: str, password: str) ->
     if not user.is_active:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    # bcrypt is deliberately slow; check it off the event loop so other
+    # requests keep being served during logins
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
         return None
     
     return user
@@ -265,6 +303,19 @@ async def get_current_active_user(
     return current_user
 
 
+def hash_refresh_token(refresh_token: str) -> bytes:
+    """
+    Digest a refresh token for storage and lookup.
+    
+    Args:
+        refresh_token: Refresh token
+        
+    Returns:
+        bytes: The 32-byte SHA-256 digest of the token
+    """
+    return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+
 async def save_refresh_token(
     session: AsyncSession,
     user_id: UUID,
@@ -289,7 +340,7 @@ async def save_refresh_token(
     
     user_session = UserSession(
         user_id=user_id,
-        refresh_token=refresh_token,
+        refresh_token_hash=hash_refresh_token(refresh_token),
         user_agent=user_agent,
         ip_address=ip_address,
         expires_at=expires_at
@@ -314,7 +365,7 @@ async def get_user_session(session: AsyncSession, refresh_token: str) -> Optiona
         Optional[UserSession]: User session if found, None otherwise
     """
     statement = select(UserSession).where(
-        UserSession.refresh_token == refresh_token,
+        UserSession.refresh_token_hash == hash_refresh_token(refresh_token),
         UserSession.is_active == True,
         UserSession.expires_at > datetime.now(timezone.utc)
     )
@@ -333,14 +384,17 @@ async def invalidate_refresh_token(session: AsyncSession, refresh_token: str) ->
     Returns:
         bool: True if token was invalidated, False otherwise
     """
-    user_session = await get_user_session(session, refresh_token)
+    statement = update(UserSession).where(
+        UserSession.refresh_token_hash == hash_refresh_token(refresh_token),
+        UserSession.is_active == True,
+        UserSession.expires_at > datetime.now(timezone.utc)
+    ).values(is_active=False).returning(UserSession.id).execution_options(synchronize_session=False)
+    result = await session.execute(statement)
+    invalidated = result.first() is not None
     
-    if user_session:
-        user_session.is_active = False
-        await session.commit()
-        return True
+    await session.commit()
     
-    return False
+    return invalidated
 
 
 async def invalidate_all_user_sessions(session: AsyncSession, user_id: UUID) -> None:
@@ -351,14 +405,11 @@ async def invalidate_all_user_sessions(session: AsyncSession, user_id: UUID) ->
         session: Database session
         user_id: User ID
     """
-    statement = select(UserSession).where(
+    statement = update(UserSession).where(
         UserSession.user_id == user_id,
         UserSession.is_active == True
-    )
-    result = await session.execute(statement)
-    
-    for user_session in result.scalars().all():
-        user_session.is_active = False
+    ).values(is_active=False).execution_options(synchronize_session=False)
+    await session.execute(statement)
     
     await session.commit()
 
@@ -396,59 +447,26 @@ async def clear_user_account_data(session: AsyncSession, user_id: UUID) -> Dict[
     }
     
     try:
-        # Delete all user sessions (logout from all devices)
-        sessions_stmt = select(UserSession).where(UserSession.user_id == user_id)
-        sessions_result = await session.execute(sessions_stmt)
-        user_sessions = sessions_result.scalars().all()
-        counts["user_sessions"] = len(user_sessions)
-        
-        for user_session in user_sessions:
-            await session.delete(user_session)
-        
-        # Delete all AI commands
-        ai_stmt = select(AICommand).where(AICommand.user_id == user_id)
-        ai_result = await session.execute(ai_stmt)
-        ai_commands = ai_result.scalars().all()
-        counts["ai_commands"] = len(ai_commands)
-        
-        for ai_command in ai_commands:
-            await session.delete(ai_command)
-        
-        # Delete all journal entries
-        journal_stmt = select(JournalEntry).where(JournalEntry.user_id == user_id)
-        journal_result = await session.execute(journal_stmt)
-        journal_entries = journal_result.scalars().all()
-        counts["journal_entries"] = len(journal_entries)
-        
-        for journal_entry in journal_entries:
-            await session.delete(journal_entry)
-        
-        # Delete all calendar events
-        calendar_stmt = select(CalendarEvent).where(CalendarEvent.user_id == user_id)
-        calendar_result = await session.execute(calendar_stmt)
-        calendar_events = calendar_result.scalars().all()
-        counts["calendar_events"] = len(calendar_events)
-        
-        for calendar_event in calendar_events:
-            await session.delete(calendar_event)
-        
-        # Delete all cards first (foreign key constraint)
-        cards_stmt = select(Card).join(Board).where(Board.user_id == user_id)
-        cards_result = await session.execute(cards_stmt)
-        cards = cards_result.scalars().all()
-        counts["cards"] = len(cards)
-        
-        for card in cards:
-            await session.delete(card)
-        
-        # Delete all boards
-        boards_stmt = select(Board).where(Board.user_id == user_id)
-        boards_result = await session.execute(boards_stmt)
-        boards = boards_result.scalars().all()
-        counts["boards"] = len(boards)
+        # Each category is cleared with one set-based DELETE instead of loading
+        # and deleting rows one at a time
+        deletes = (
+            # Delete all user sessions (logout from all devices)
+            ("user_sessions", delete(UserSession).where(UserSession.user_id == user_id)),
+            ("ai_commands", delete(AICommand).where(AICommand.user_id == user_id)),
+            ("journal_entries", delete(JournalEntry).where(JournalEntry.user_id == user_id)),
+            ("calendar_events", delete(CalendarEvent).where(CalendarEvent.user_id == user_id)),
+            # Delete all cards first (foreign key constraint)
+            ("cards", delete(Card).where(
+                Card.board_id.in_(select(Board.id).where(Board.user_id == user_id))
+            )),
+            ("boards", delete(Board).where(Board.user_id == user_id)),
+        )
         
-        for board in boards:
-            await session.delete(board)
+        for category, statement in deletes:
+            result = await session.execute(
+                statement.execution_options(synchronize_session=False)
+            )
+            counts[category] = result.rowcount
         
         # Reset user preferences to default
         user = await get_user_by_id(session, user_id)
@@ -16,10 +16,21 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=0,
-    pool_recycle=3600,
-    pool_timeout=30,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout,
+    # Compiled SQL cache shared by every statement shape the tools and
+    # endpoints issue; the default 500 entries is easily churned
+    query_cache_size=1200,
+    connect_args={
+        # Tool queries are tiny; JIT compilation only adds planning latency
+        "server_settings": {"jit": "off"},
+        # asyncpg's own statement cache, plus SQLAlchemy's prepared
+        # statement cache in front of it, for the small repeated queries
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+    },
 )
 
 # Create async session factory using SQLModel's AsyncSession
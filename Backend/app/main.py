@@ -6,6 +6,7 @@ import json
 import logging
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
@@ -13,6 +14,7 @@ import json
 from datetime import datetime
 
 from app.config import settings
+from app.core.ai_tools import close_http_clients
 from app.core.auth import get_current_user, verify_token
 from app.core.exceptions import add_exception_handlers
 from app.core.logging import setup_logging
@@ -60,21 +62,23 @@ async def lifespan(app: FastAPI):
             # Close database connections
             await close_db()
             logger.info("Database connections closed")
+            
+            # Close pooled HTTP connections used by the AI tools
+            await close_http_clients()
         except Exception as e:
             logger.error(f"Shutdown error: {e}")
 
 
-# Custom JSON encoder for datetime objects
+# Custom JSON encoder using orjson, which handles UUID/datetime natively.
+# Unlike JSONResponse's allow_nan=False, orjson doesn't reject NaN/Infinity;
+# it writes them as null, which is still valid JSON for clients.
 class CustomJSONResponse(JSONResponse):
     def render(self, content) -> bytes:
-        return json.dumps(
+        return orjson.dumps(
             content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
             default=jsonable_encoder,
-        ).encode("utf-8")
+            option=orjson.OPT_NON_STR_KEYS,
+        )
 
 # Create FastAPI application
 app = FastAPI(
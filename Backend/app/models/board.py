@@ -12,6 +12,7 @@ class Board(SQLModel, table=True):
     """Board model for Kanban boards"""
     
     __tablename__ = "boards"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[UUID] = Field(
         default_factory=uuid4,
@@ -56,6 +57,7 @@ class Card(SQLModel, table=True):
     """Card model for Kanban cards"""
     
     __tablename__ = "cards"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[UUID] = Field(
         default_factory=uuid4,
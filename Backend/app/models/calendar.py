@@ -12,6 +12,7 @@ class CalendarEvent(SQLModel, table=True):
     """Calendar event model for scheduling functionality"""
     
     __tablename__ = "calendar_events"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[UUID] = Field(
         default_factory=uuid4,
@@ -12,6 +12,7 @@ class JournalEntry(SQLModel, table=True):
     """Journal entry model for journaling functionality"""
     
     __tablename__ = "journal_entries"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[UUID] = Field(
         default_factory=uuid4,
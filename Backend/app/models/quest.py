@@ -12,6 +12,7 @@ class Quest(SQLModel, table=True):
     """Quest task model for daily rolling to-do system"""
     
     __tablename__ = "quests"
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[UUID] = Field(
         default_factory=uuid4,
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel, Field, Column, JSON
-from sqlalchemy import TIMESTAMP, text, ForeignKey, String
+from sqlalchemy import TIMESTAMP, text, ForeignKey, LargeBinary, String
 
 
 class User(SQLModel, table=True):
@@ -66,7 +66,10 @@ class UserSession(SQLModel, table=True):
         sa_column_kwargs={"server_default": text("uuid_generate_v4()")}
     )
     user_id: UUID = Field(sa_column=Column(ForeignKey("users.id", ondelete="CASCADE")))
-    refresh_token: str = Field(max_length=255, index=True)
+    # SHA-256 digest of the refresh token; the token itself is never stored
+    refresh_token_hash: bytes = Field(
+        sa_column=Column(LargeBinary(32), nullable=False, unique=True)
+    )
     user_agent: Optional[str] = Field(default=None)
     ip_address: Optional[str] = Field(default=None, sa_column=Column(String(45)))
     expires_at: datetime = Field(
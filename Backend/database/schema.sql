@@ -1,8 +1,9 @@
 -- Skema Database Schema
 -- Production-ready PostgreSQL schema with JSONB support
 
--- Enable UUID extension
+-- Enable UUID and trigram extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Users table
 CREATE TABLE users (
@@ -156,7 +157,7 @@ CREATE TABLE ai_commands (
 CREATE TABLE user_sessions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    refresh_token VARCHAR(255) NOT NULL,
+    refresh_token_hash BYTEA NOT NULL,
     user_agent TEXT,
     ip_address INET,
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
@@ -164,6 +165,21 @@ CREATE TABLE user_sessions (
     is_active BOOLEAN DEFAULT TRUE
 );
 
+-- Quests table (daily tasks)
+CREATE TABLE quests (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    content VARCHAR(1000) NOT NULL,
+    is_complete BOOLEAN NOT NULL,
+    date_created DATE NOT NULL,
+    date_due DATE,
+    time_due VARCHAR(8),
+    order_index INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
 -- Audit log table (for security and compliance)
 CREATE TABLE audit_logs (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -193,6 +209,8 @@ CREATE INDEX idx_cards_position ON cards(board_id, position);
 CREATE INDEX idx_calendar_events_user_id ON calendar_events(user_id);
 CREATE INDEX idx_calendar_events_date_range ON calendar_events(start_datetime, end_datetime);
 CREATE INDEX idx_calendar_events_type ON calendar_events(event_type);
+CREATE INDEX idx_calendar_events_user_start ON calendar_events(user_id, start_datetime DESC);
+CREATE INDEX idx_calendar_events_title_trgm ON calendar_events USING GIN(title gin_trgm_ops);
 
 CREATE INDEX idx_journal_entries_user_id ON journal_entries(user_id);
 CREATE INDEX idx_journal_entries_date ON journal_entries(entry_date);
@@ -201,8 +219,17 @@ CREATE INDEX idx_journal_entries_tags ON journal_entries USING GIN(tags);
 CREATE INDEX idx_ai_commands_user_id ON ai_commands(user_id);
 CREATE INDEX idx_ai_commands_context ON ai_commands(context_type, context_id);
 
+CREATE INDEX ix_quests_user_id ON quests(user_id);
+CREATE INDEX ix_quests_date_created ON quests(date_created);
+CREATE INDEX idx_quests_content_trgm ON quests USING GIN(content gin_trgm_ops);
+CREATE INDEX idx_quests_user_date_order ON quests(user_id, date_created, order_index)
+    INCLUDE (id, is_complete, content, date_due, time_due);
+CREATE INDEX idx_quests_user_date_pending ON quests(user_id, date_created, order_index)
+    WHERE is_complete = false;
+CREATE INDEX idx_quests_user_date_content_prefix ON quests(user_id, date_created, lower(content) text_pattern_ops);
+
 CREATE INDEX idx_user_sessions_user_id ON user_sessions(user_id);
-CREATE INDEX idx_user_sessions_token ON user_sessions(refresh_token);
+CREATE UNIQUE INDEX idx_user_sessions_token_hash ON user_sessions(refresh_token_hash);
 CREATE INDEX idx_user_sessions_expires ON user_sessions(expires_at);
 
 CREATE INDEX idx_audit_logs_user_id ON audit_logs(user_id);
@@ -0,0 +1,46 @@
+"""Add indexes for AI tool title/content lookups
+
+Revision ID: 003_add_ai_tool_lookup_indexes
+Revises: 002_add_quest_table
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_add_ai_tool_lookup_indexes'
+down_revision = '002_add_quest_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram indexes let ILIKE '%...%' lookups probe an index instead of
+    # scanning every row for the user
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'idx_calendar_events_title_trgm', 'calendar_events', ['title'],
+        unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'idx_quests_content_trgm', 'quests', ['content'],
+        unique=False, postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}
+    )
+
+    # Composite indexes matching the tools' WHERE/ORDER BY
+    op.create_index(
+        'idx_calendar_events_user_start', 'calendar_events',
+        ['user_id', sa.text('start_datetime DESC')], unique=False
+    )
+    op.create_index(
+        'idx_quests_user_date_order', 'quests',
+        ['user_id', 'date_created', 'order_index'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_quests_user_date_order', table_name='quests')
+    op.drop_index('idx_calendar_events_user_start', table_name='calendar_events')
+    op.drop_index('idx_quests_content_trgm', table_name='quests')
+    op.drop_index('idx_calendar_events_title_trgm', table_name='calendar_events')
@@ -0,0 +1,28 @@
+"""Add partial index for pending quests
+
+Revision ID: 004_add_pending_quests_index
+Revises: 003_add_ai_tool_lookup_indexes
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_add_pending_quests_index'
+down_revision = '003_add_ai_tool_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Pending quests for a day are read far more often than the full history
+    op.create_index(
+        'idx_quests_user_date_pending', 'quests',
+        ['user_id', 'date_created', 'order_index'],
+        unique=False, postgresql_where=sa.text('is_complete = false')
+    )
+
+
+def downgrade():
+    op.drop_index('idx_quests_user_date_pending', table_name='quests')
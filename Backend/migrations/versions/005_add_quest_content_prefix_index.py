@@ -0,0 +1,29 @@
+"""Add prefix index for short quest content lookups
+
+Revision ID: 005_add_quest_content_prefix_index
+Revises: 004_add_pending_quests_index
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_add_quest_content_prefix_index'
+down_revision = '004_add_pending_quests_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Text shorter than a trigram can't use the GIN trgm index, so those
+    # lookups fall back to a lower(content) LIKE 'x%' prefix match
+    op.create_index(
+        'idx_quests_user_date_content_prefix', 'quests',
+        ['user_id', 'date_created', sa.text('lower(content) text_pattern_ops')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('idx_quests_user_date_content_prefix', table_name='quests')
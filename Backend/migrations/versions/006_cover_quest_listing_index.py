@@ -0,0 +1,34 @@
+"""Make the quest day/order index covering
+
+Revision ID: 006_cover_quest_listing_index
+Revises: 005_add_quest_content_prefix_index
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_cover_quest_listing_index'
+down_revision = '005_add_quest_content_prefix_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Carry the listed columns in the index so a day's quests can be read
+    # with an index-only scan, already in order_index order
+    op.drop_index('idx_quests_user_date_order', table_name='quests')
+    op.create_index(
+        'idx_quests_user_date_order', 'quests',
+        ['user_id', 'date_created', 'order_index'], unique=False,
+        postgresql_include=['id', 'is_complete', 'content', 'date_due', 'time_due']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_quests_user_date_order', table_name='quests')
+    op.create_index(
+        'idx_quests_user_date_order', 'quests',
+        ['user_id', 'date_created', 'order_index'], unique=False
+    )
@@ -0,0 +1,45 @@
+"""Store refresh tokens as SHA-256 digests
+
+Revision ID: 007_hash_refresh_tokens
+Revises: 006_cover_quest_listing_index
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_hash_refresh_tokens'
+down_revision = '006_cover_quest_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lookups go through a fixed-width 32-byte key, and a leaked table no
+    # longer hands out usable refresh tokens
+    op.add_column('user_sessions', sa.Column('refresh_token_hash', sa.LargeBinary(32), nullable=True))
+    op.execute(
+        "UPDATE user_sessions SET refresh_token_hash = sha256(convert_to(refresh_token, 'UTF8'))"
+    )
+    op.alter_column('user_sessions', 'refresh_token_hash', nullable=False)
+    op.create_index(
+        'idx_user_sessions_token_hash', 'user_sessions', ['refresh_token_hash'], unique=True
+    )
+
+    op.drop_index('idx_user_sessions_token', table_name='user_sessions')
+    op.drop_column('user_sessions', 'refresh_token')
+
+
+def downgrade():
+    # The raw tokens can't be recovered from their digests, so existing
+    # sessions are deactivated and their users sign in again
+    op.add_column('user_sessions', sa.Column('refresh_token', sa.String(255), nullable=True))
+    op.execute(
+        "UPDATE user_sessions SET refresh_token = encode(refresh_token_hash, 'hex'), is_active = false"
+    )
+    op.alter_column('user_sessions', 'refresh_token', nullable=False)
+    op.create_index('idx_user_sessions_token', 'user_sessions', ['refresh_token'])
+
+    op.drop_index('idx_user_sessions_token_hash', table_name='user_sessions')
+    op.drop_column('user_sessions', 'refresh_token_hash')
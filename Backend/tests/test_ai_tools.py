@@ -0,0 +1,125 @@
+"""
+Tests for AI tool batching and tool behaviour
+"""
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import func, select
+
+from app.core import ai_tools
+from app.core.ai_tools import execute_ai_tool, execute_ai_tools
+from app.models.board import Board, Card
+
+
+class FakeSession:
+    """Records the transactions _transaction opens and how they end"""
+
+    def __init__(self):
+        self.transactions: List[str] = []
+
+    def in_transaction(self) -> bool:
+        return False
+
+    @asynccontextmanager
+    async def begin(self):
+        try:
+            yield
+        except BaseException:
+            self.transactions.append("rollback")
+            raise
+        self.transactions.append("commit")
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    """Replace tool dispatch with a stub that fails 'bad' calls like a database error would"""
+    calls: List[Tuple[str, bool]] = []
+
+    async def fake_execute_ai_tool(tool_name: str, parameters: Dict[str, Any], user, session) -> Dict[str, Any]:
+        batched = ai_tools._in_batch.get()
+        calls.append((tool_name, batched))
+        if tool_name == "bad":
+            if batched:
+                raise SQLAlchemyError("constraint violated")
+            return {"success": False, "error": "constraint violated"}
+        if tool_name == "buggy":
+            raise TypeError("not a tool failure")
+        return {"success": True, "tool": tool_name}
+
+    monkeypatch.setattr(ai_tools, "execute_ai_tool", fake_execute_ai_tool)
+    return calls
+
+
+async def test_batch_commits_once(fake_tools):
+    session = FakeSession()
+
+    results = await execute_ai_tools([("a", {}), ("b", {})], None, session)
+
+    assert results == [{"success": True, "tool": "a"}, {"success": True, "tool": "b"}]
+    assert session.transactions == ["commit"]
+    assert fake_tools == [("a", True), ("b", True)]
+
+
+async def test_batch_rolls_back_and_replays_one_by_one(fake_tools):
+    session = FakeSession()
+
+    results = await execute_ai_tools([("a", {}), ("bad", {}), ("c", {})], None, session)
+
+    assert results == [
+        {"success": True, "tool": "a"},
+        {"success": False, "error": "constraint violated"},
+        {"success": True, "tool": "c"},
+    ]
+    assert session.transactions == ["rollback"]
+    # The batch stops at the failing call, then every call is replayed on its own
+    assert fake_tools == [
+        ("a", True), ("bad", True),
+        ("a", False), ("bad", False), ("c", False),
+    ]
+
+
+async def test_batch_does_not_replay_programming_errors(fake_tools):
+    session = FakeSession()
+
+    with pytest.raises(TypeError):
+        await execute_ai_tools([("a", {}), ("buggy", {})], None, session)
+
+    assert session.transactions == ["rollback"]
+    assert fake_tools == [("a", True), ("buggy", True)]
+
+
+@pytest.mark.integration
+async def test_create_card_rejects_another_users_board(db_session, make_user):
+    owner = await make_user()
+    other = await make_user()
+    board = Board(user_id=owner.id, title="Owner's board")
+    db_session.add(board)
+    await db_session.commit()
+
+    result = await execute_ai_tool(
+        "create_card", {"board_id": str(board.id), "title": "Sneaky card"}, other, db_session
+    )
+
+    assert result["success"] is False
+    card_count = (await db_session.execute(select(func.count()).select_from(Card))).scalar_one()
+    assert card_count == 0
+
+
+@pytest.mark.integration
+async def test_create_card_writes_default_metadata(db_session, make_user):
+    owner = await make_user()
+    board = Board(user_id=owner.id, title="Owner's board")
+    db_session.add(board)
+    await db_session.commit()
+
+    result = await execute_ai_tool(
+        "create_card",
+        {"board_id": str(board.id), "title": "Card", "due_date": "2026-10-20"},
+        owner, db_session
+    )
+
+    assert result["success"] is True
+    card = (await db_session.execute(select(Card).where(Card.id == result["id"]))).scalar_one()
+    assert card.card_metadata == {**Card.model_fields["card_metadata"].default_factory(), "due_date": "2026-10-20"}
@@ -0,0 +1,54 @@
+"""
+Tests for refresh token storage and rotation
+"""
+import pytest
+from sqlmodel import select
+
+from app.core.auth import (
+    create_refresh_token, get_user_session, hash_refresh_token,
+    invalidate_refresh_token, save_refresh_token
+)
+from app.models.user import UserSession
+
+
+def test_hash_refresh_token_is_a_fixed_width_digest():
+    token = create_refresh_token(data={"sub": "user"})
+
+    digest = hash_refresh_token(token)
+
+    assert len(digest) == 32
+    assert digest == hash_refresh_token(token)
+    assert digest != hash_refresh_token(token + "x")
+
+
+@pytest.mark.integration
+async def test_refresh_token_is_stored_only_as_its_digest(db_session, make_user):
+    user = await make_user()
+    token = create_refresh_token(data={"sub": str(user.id)})
+
+    await save_refresh_token(db_session, user.id, token)
+
+    stored = (await db_session.execute(select(UserSession))).scalar_one()
+    assert stored.refresh_token_hash == hash_refresh_token(token)
+    assert token.encode("utf-8") not in stored.refresh_token_hash
+
+
+@pytest.mark.integration
+async def test_refresh_token_can_only_be_rotated_once(db_session, make_user):
+    user = await make_user()
+    token = create_refresh_token(data={"sub": str(user.id)})
+    await save_refresh_token(db_session, user.id, token)
+
+    assert await get_user_session(db_session, token) is not None
+
+    # The first rotation claims the token; any later one sees it as spent
+    assert await invalidate_refresh_token(db_session, token) is True
+    assert await invalidate_refresh_token(db_session, token) is False
+    assert await get_user_session(db_session, token) is None
+
+
+@pytest.mark.integration
+async def test_invalidate_unknown_refresh_token(db_session, make_user):
+    await make_user()
+
+    assert await invalidate_refresh_token(db_session, "never-issued") is False